@@ -6,7 +6,7 @@ a = Analysis(
     pathex=['.'],
     binaries=[],
     datas=[('config.ini', '.'), ('Gibbscam.ico', '.')],
-    hiddenimports=['win32com.client', 'win32gui', 'win32process', 'psutil', 'pandas', 'openpyxl', 'windows_toasts', 'PIL', 'PIL.Image', 'PIL.ImageTk', 'PIL.ImageGrab', 'tkinter', 'tkinter.ttk', 'tkinter.messagebox'],
+    hiddenimports=['win32com.client', 'win32gui', 'win32process', 'pandas', 'openpyxl', 'windows_toasts', 'PIL', 'PIL.Image', 'PIL.ImageTk', 'PIL.ImageGrab', 'tkinter', 'tkinter.ttk', 'tkinter.messagebox'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
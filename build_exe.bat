@@ -30,7 +30,6 @@ pyinstaller ^
     --hidden-import=win32com.client ^
     --hidden-import=win32gui ^
     --hidden-import=win32process ^
-    --hidden-import=psutil ^
     --hidden-import=pandas ^
     --hidden-import=openpyxl ^
     --hidden-import=windows_toasts ^
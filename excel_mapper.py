@@ -15,9 +15,12 @@ CSV Format:
 """
 
 import logging
+import math
+import os
 from pathlib import Path
 from typing import Optional
 import time
+import zipfile
 import config
 import screenshot_gui
 
@@ -28,6 +31,11 @@ except ImportError:
     pd = None
     logging.warning("pandas not installed - Excel mapping will not work")
 
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
 try:
     import win32com.client as win32
     from pywintypes import com_error
@@ -38,13 +46,125 @@ except ImportError:
     logging.error("win32com not available - Excel mapping requires pywin32")
 
 
+def _xml_backend_supported(template_path: Path) -> bool:
+    """
+    Check whether a template can be written without Excel.
+    
+    openpyxl drops drawings (images, shapes, charts) and cannot keep macros
+    in an .xlsx, so any template containing those must go through COM.
+    """
+    if openpyxl is None:
+        logging.warning("openpyxl not installed - XML backend unavailable")
+        return False
+    
+    try:
+        with zipfile.ZipFile(template_path) as zf:
+            for name in zf.namelist():
+                if name.startswith(("xl/drawings/", "xl/charts/", "xl/media/")) or name == "xl/vbaProject.bin":
+                    return False
+    except zipfile.BadZipFile:
+        logging.warning(f"Template is not an xlsx package: {template_path}")
+        return False
+    
+    return True
+
+
+def _excel_value(value):
+    """
+    Convert a numeric-looking string to a number, as Excel does on a COM
+    Range.Value assignment.
+    
+    Without this the XML backend would store values such as "1234" or "+1.5"
+    as text, which template formulas don't treat as numbers. Axis-prefixed
+    coordinates ("X12.5") and other text are returned unchanged.
+    """
+    if not isinstance(value, str):
+        return value
+    
+    text = value.strip()
+    if not text or text[0] not in "+-.0123456789" or "_" in text:
+        return value
+    
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        number = float(text)
+    except ValueError:
+        return value
+    return number if math.isfinite(number) else value
+
+
+def _write_values_xml(template_path: Path, output_path: Path, sheet_name: str,
+                      cell_values: list) -> Optional[Path]:
+    """
+    Write mapped values straight into the xlsx with openpyxl (no Excel process).
+    
+    Args:
+        template_path: Path to Excel template file
+        output_path: Path for output Excel file
+        sheet_name: Name of worksheet to update
+        cell_values: List of (csv_key, cell, value) tuples
+        
+    Returns:
+        Path to output file on success, None on failure
+    """
+    logging.info("Using openpyxl to write values directly (no Excel COM)...")
+    
+    try:
+        wb = openpyxl.load_workbook(template_path, keep_vba=False)
+    except Exception as e:
+        logging.error(f"Could not open template with openpyxl: {e}")
+        return None
+    
+    if sheet_name not in wb.sheetnames:
+        logging.error(f"Worksheet '{sheet_name}' not found in template")
+        return None
+    
+    ws = wb[sheet_name]
+    logging.info(f"✓ Working with worksheet: {sheet_name}")
+    
+    mapping_count = 0
+    for csv_key, target_cell, value in cell_values:
+        try:
+            ws[target_cell] = _excel_value(value)
+            mapping_count += 1
+            if value == "":
+                logging.debug(f"Mapped {csv_key} -> {target_cell} = (blank)")
+            else:
+                logging.debug(f"Mapped {csv_key} -> {target_cell} = {value}")
+        except Exception as e:
+            logging.error(f"Error writing to cell {target_cell}: {e}")
+    
+    logging.info(f"✓ Mapped {mapping_count} values to Excel")
+    
+    logging.info(f"Saving to: {output_path}")
+    try:
+        wb.save(output_path)
+    except PermissionError:
+        logging.error(f"Permission denied writing to {output_path} (is it open in Excel?)")
+        return None
+    except Exception as e:
+        logging.error(f"Error saving Excel file: {e}")
+        return None
+    
+    logging.info("✓ Excel file saved")
+    return output_path
+
+
 def map_csv_to_excel(csv_path: Path, template_path: Path, output_path: Path,
                      sheet_name: str, open_excel: bool = False,
-                     enable_screenshots: bool = False) -> Optional[Path]:
+                     enable_screenshots: bool = False,
+                     backend: str = "com") -> Optional[Path]:
     """
     Map CSV data into Excel template using Excel COM automation.
     This preserves all images, formatting, and embedded objects.
     
+    With backend="xml" the data-only pass (open_excel and enable_screenshots
+    both False) writes the xlsx directly with openpyxl instead of starting
+    Excel. Templates with drawings or macros always use COM.
+    
     Args:
         csv_path: Path to CSV file with coordinate data
         template_path: Path to Excel template file
@@ -52,6 +172,7 @@ def map_csv_to_excel(csv_path: Path, template_path: Path, output_path: Path,
         sheet_name: Name of worksheet to update
         open_excel: Whether to keep Excel visible after processing
         enable_screenshots: Whether to open screenshot GUI after mapping
+        backend: "com" (default) or "xml"
         
     Returns:
         Path to output file on success, None on failure
@@ -115,39 +236,8 @@ def map_csv_to_excel(csv_path: Path, template_path: Path, output_path: Path,
             'G57': 3
         }
 
-        # === USE EXCEL COM FOR EVERYTHING ===
-        logging.info("Using Excel COM to preserve all images and formatting...")
-        
-        # Get or create Excel instance
-        try:
-            excel_app = win32.GetObject(Class="Excel.Application")
-            logging.debug("Connected to existing Excel instance")
-        except:
-            excel_app = win32.Dispatch("Excel.Application")
-            logging.debug("Created new Excel instance")
-        
-        # CRITICAL: Keep Excel hidden from the start
-        excel_app.Visible = False
-        excel_app.DisplayAlerts = False
-        excel_app.ScreenUpdating = False
-        logging.debug("Excel set to hidden mode from start")
-        
-        # Open template
-        logging.info(f"Opening template: {template_path}")
-        wb = excel_app.Workbooks.Open(str(template_path.absolute()))
-        
-        # Get worksheet
-        try:
-            ws = wb.Worksheets(sheet_name)
-        except:
-            logging.error(f"Worksheet '{sheet_name}' not found in template")
-            wb.Close(SaveChanges=False)
-            return None
-        
-        logging.info(f"✓ Working with worksheet: {sheet_name}")
-
-        # Process each mapping from config
-        mapping_count = 0
+        # Resolve every mapped value up front - no Excel needed for this part
+        cell_values = []
         for csv_key, excel_cell in config.CONFIG["EXCEL_MAPPING"].items():
             try:
                 value = None
@@ -224,34 +314,83 @@ def map_csv_to_excel(csv_path: Path, template_path: Path, output_path: Path,
                                         value = formatted_value
                                         logging.debug(f"  {csv_key} = {value}")
 
-                # Write value to Excel cell using COM
                 if value is not None:
                     # Handle both single cells and ranges (use first cell)
                     target_cell = excel_cell.split(':')[0] if ':' in excel_cell else excel_cell
-                    
-                    try:
-                        ws.Range(target_cell).Value = value
-                        mapping_count += 1
-                        if value == "":
-                            logging.debug(f"Mapped {csv_key} -> {target_cell} = (blank)")
-                        else:
-                            logging.debug(f"Mapped {csv_key} -> {target_cell} = {value}")
-                    except com_error as e:
-                        logging.error(f"Error writing to cell {target_cell}: {e}")
+                    cell_values.append((csv_key, target_cell, value))
 
             except Exception as e:
                 logging.error(f"Error mapping {csv_key} -> {excel_cell}: {e}")
 
+        # === XML BACKEND: write the xlsx directly, no Excel process ===
+        # Only for the data-only pass (nothing to show or screenshot afterwards)
+        if backend == "xml" and not open_excel and not enable_screenshots:
+            if _xml_backend_supported(template_path):
+                return _write_values_xml(template_path, output_path, sheet_name, cell_values)
+            logging.info("Template has drawings or macros - falling back to Excel COM")
+
+        # === USE EXCEL COM FOR EVERYTHING ===
+        logging.info("Using Excel COM to preserve all images and formatting...")
+        
+        # Get or create Excel instance
+        try:
+            excel_app = win32.GetObject(Class="Excel.Application")
+            logging.debug("Connected to existing Excel instance")
+        except:
+            excel_app = win32.Dispatch("Excel.Application")
+            logging.debug("Created new Excel instance")
+        
+        # CRITICAL: Keep Excel hidden from the start
+        excel_app.Visible = False
+        excel_app.DisplayAlerts = False
+        excel_app.ScreenUpdating = False
+        logging.debug("Excel set to hidden mode from start")
+        
+        # Open template
+        logging.info(f"Opening template: {template_path}")
+        wb = excel_app.Workbooks.Open(str(template_path.absolute()))
+        
+        # Get worksheet
+        try:
+            ws = wb.Worksheets(sheet_name)
+        except:
+            logging.error(f"Worksheet '{sheet_name}' not found in template")
+            wb.Close(SaveChanges=False)
+            return None
+        
+        logging.info(f"✓ Working with worksheet: {sheet_name}")
+
+        # Process each mapping from config
+        mapping_count = 0
+        for csv_key, target_cell, value in cell_values:
+            try:
+                ws.Range(target_cell).Value = value
+                mapping_count += 1
+                if value == "":
+                    logging.debug(f"Mapped {csv_key} -> {target_cell} = (blank)")
+                else:
+                    logging.debug(f"Mapped {csv_key} -> {target_cell} = {value}")
+            except com_error as e:
+                logging.error(f"Error writing to cell {target_cell}: {e}")
+
         logging.info(f"✓ Mapped {mapping_count} values to Excel")
 
         # Save as output file
         logging.info(f"Saving to: {output_path}")
         try:
-            # Close the output file if it's already open in Excel
-            for i in range(1, excel_app.Workbooks.Count + 1):
+            # Close the output file if it's already open in Excel.
+            # Plain string compare first; resolve() only for same-named files.
+            target = os.path.normcase(os.path.abspath(output_path))
+            target_name = os.path.basename(target)
+            workbook_count = excel_app.Workbooks.Count
+            for i in range(1, workbook_count + 1):
                 try:
                     wb_check = excel_app.Workbooks(i)
-                    if Path(wb_check.FullName).resolve() == output_path.resolve():
+                    full_name = os.path.normcase(os.path.abspath(wb_check.FullName))
+                    if full_name == target or (
+                        os.path.basename(full_name) == target_name
+                        and Path(full_name).resolve() == output_path.resolve()
+                    ):
                         logging.info(f"Output file already open - closing it first")
                         wb_check.Close(SaveChanges=False)
                         break
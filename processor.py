@@ -21,6 +21,13 @@ import ncf_parser
 import excel_mapper
 import window_detector
 
+try:
+    import win32gui
+    import win32con
+except ImportError:
+    win32gui = None
+    win32con = None
+
 
 def process_ncf_file(ncf_file: Path, template: Path, out_dir: Path, 
                      temp_csv_dir: Path, sheet_name: str, 
@@ -74,28 +81,8 @@ def process_ncf_file(ncf_file: Path, template: Path, out_dir: Path,
         
         # BRING GIBBSCAM TO FOREGROUND FIRST
         try:
-            import win32gui
-            import win32process
-            import win32con
-            import psutil
-            
-            def find_virtual_exe():
-                virtual_windows = []
-                def callback(hwnd, _):
-                    if win32gui.IsWindowVisible(hwnd):
-                        try:
-                            _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                            process = psutil.Process(pid)
-                            if 'virtual.exe' in process.name().lower():
-                                virtual_windows.append(hwnd)
-                        except:
-                            pass
-                win32gui.EnumWindows(callback, None)
-                return virtual_windows
-            
-            virtual_windows = find_virtual_exe()
-            if virtual_windows:
-                hwnd = virtual_windows[0]
+            hwnd = window_detector.get_main_virtual_exe_window()
+            if hwnd and win32gui:
                 win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
                 win32gui.ShowWindow(hwnd, win32con.SW_MAXIMIZE)
                 win32gui.SetForegroundWindow(hwnd)
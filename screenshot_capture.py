@@ -6,6 +6,8 @@ Handles screenshot capture with fixed-size selection rectangle.
 
 import logging
 import tkinter as tk
+import ctypes
+import ctypes.wintypes
 
 try:
     from PIL import Image, ImageTk, ImageGrab
@@ -14,6 +16,118 @@ except ImportError:
     PIL_AVAILABLE = False
     logging.error("PIL/Pillow not available - install with: pip install pillow")
 
+_SRCCOPY = 0x00CC0020
+_DIB_RGB_COLORS = 0
+_DPI_AWARENESS_CONTEXT_PER_MONITOR_AWARE = ctypes.c_void_p(-3)
+
+
+class _BITMAPINFOHEADER(ctypes.Structure):
+    _fields_ = [
+        ("biSize", ctypes.wintypes.DWORD),
+        ("biWidth", ctypes.wintypes.LONG),
+        ("biHeight", ctypes.wintypes.LONG),
+        ("biPlanes", ctypes.wintypes.WORD),
+        ("biBitCount", ctypes.wintypes.WORD),
+        ("biCompression", ctypes.wintypes.DWORD),
+        ("biSizeImage", ctypes.wintypes.DWORD),
+        ("biXPelsPerMeter", ctypes.wintypes.LONG),
+        ("biYPelsPerMeter", ctypes.wintypes.LONG),
+        ("biClrUsed", ctypes.wintypes.DWORD),
+        ("biClrImportant", ctypes.wintypes.DWORD),
+    ]
+
+
+# Private DLL instances: setting argtypes/restype on ctypes.windll.* would
+# change those functions for every other ctypes user in the process
+try:
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    _gdi32 = ctypes.WinDLL("gdi32", use_last_error=True)
+except (AttributeError, OSError):
+    _user32 = _gdi32 = None  # Not on Windows
+else:
+    _user32.GetDC.argtypes = (ctypes.wintypes.HWND,)
+    _user32.GetDC.restype = ctypes.wintypes.HDC
+    _user32.ReleaseDC.argtypes = (ctypes.wintypes.HWND, ctypes.wintypes.HDC)
+    _user32.ReleaseDC.restype = ctypes.c_int
+    if hasattr(_user32, "SetThreadDpiAwarenessContext"):  # Windows 10 1607+
+        _user32.SetThreadDpiAwarenessContext.argtypes = (ctypes.c_void_p,)
+        _user32.SetThreadDpiAwarenessContext.restype = ctypes.c_void_p
+    _gdi32.CreateCompatibleDC.argtypes = (ctypes.wintypes.HDC,)
+    _gdi32.CreateCompatibleDC.restype = ctypes.wintypes.HDC
+    _gdi32.CreateDIBSection.argtypes = (
+        ctypes.wintypes.HDC, ctypes.POINTER(_BITMAPINFOHEADER), ctypes.wintypes.UINT,
+        ctypes.POINTER(ctypes.c_void_p), ctypes.wintypes.HANDLE, ctypes.wintypes.DWORD
+    )
+    _gdi32.CreateDIBSection.restype = ctypes.wintypes.HBITMAP
+    _gdi32.SelectObject.argtypes = (ctypes.wintypes.HDC, ctypes.wintypes.HGDIOBJ)
+    _gdi32.SelectObject.restype = ctypes.wintypes.HGDIOBJ
+    _gdi32.BitBlt.argtypes = (
+        ctypes.wintypes.HDC, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+        ctypes.wintypes.HDC, ctypes.c_int, ctypes.c_int, ctypes.wintypes.DWORD
+    )
+    _gdi32.BitBlt.restype = ctypes.wintypes.BOOL
+    _gdi32.GdiFlush.argtypes = ()
+    _gdi32.GdiFlush.restype = ctypes.wintypes.BOOL
+    _gdi32.DeleteObject.argtypes = (ctypes.wintypes.HGDIOBJ,)
+    _gdi32.DeleteObject.restype = ctypes.wintypes.BOOL
+    _gdi32.DeleteDC.argtypes = (ctypes.wintypes.HDC,)
+    _gdi32.DeleteDC.restype = ctypes.wintypes.BOOL
+
+
+def _grab_region(bbox):
+    """
+    Capture just bbox from the screen with BitBlt into a DIB section.
+    
+    ImageGrab.grab(bbox) copies the whole screen and then crops; this copies
+    only the selected rectangle. Like Pillow, the copy runs per-monitor DPI
+    aware so bbox is read in the same coordinates ImageGrab used.
+    """
+    left, top, right, bottom = bbox
+    width = right - left
+    height = bottom - top
+    
+    header = _BITMAPINFOHEADER()
+    header.biSize = ctypes.sizeof(header)
+    header.biWidth = width
+    header.biHeight = -height  # Top-down rows, as PIL expects
+    header.biPlanes = 1
+    header.biBitCount = 32
+    
+    previous_dpi = None
+    if hasattr(_user32, "SetThreadDpiAwarenessContext"):
+        previous_dpi = _user32.SetThreadDpiAwarenessContext(_DPI_AWARENESS_CONTEXT_PER_MONITOR_AWARE)
+    
+    screen_dc = _user32.GetDC(None)
+    memory_dc = _gdi32.CreateCompatibleDC(screen_dc)
+    bits = ctypes.c_void_p()
+    bitmap = _gdi32.CreateDIBSection(
+        memory_dc, ctypes.byref(header), _DIB_RGB_COLORS, ctypes.byref(bits), None, 0
+    )
+    try:
+        if not bitmap or not bits:
+            raise OSError("CreateDIBSection failed")
+        
+        old_bitmap = _gdi32.SelectObject(memory_dc, bitmap)
+        try:
+            if not _gdi32.BitBlt(memory_dc, 0, 0, width, height,
+                                screen_dc, left, top, _SRCCOPY):
+                raise OSError("BitBlt failed")
+            _gdi32.GdiFlush()
+            # The DIB section is the pixel buffer; read it straight into PIL
+            return Image.frombuffer(
+                "RGB", (width, height), ctypes.string_at(bits, width * height * 4),
+                "raw", "BGRX", 0, 1
+            )
+        finally:
+            _gdi32.SelectObject(memory_dc, old_bitmap)
+    finally:
+        if bitmap:
+            _gdi32.DeleteObject(bitmap)
+        _gdi32.DeleteDC(memory_dc)
+        _user32.ReleaseDC(None, screen_dc)
+        if previous_dpi:
+            _user32.SetThreadDpiAwarenessContext(previous_dpi)
+
 
 class ScreenshotCapture:
     """Handles screenshot capture with a fixed size selection."""
@@ -131,7 +245,11 @@ class ScreenshotCapture:
                 self.start_y + self.height_px
             )
             
-            self.screenshot = ImageGrab.grab(bbox)
+            try:
+                self.screenshot = _grab_region(bbox)
+            except Exception as e:
+                logging.warning(f"Region capture failed, using ImageGrab: {e}")
+                self.screenshot = ImageGrab.grab(bbox)
             self.capture_window.destroy()
             
             if self.callback:
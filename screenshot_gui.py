@@ -10,9 +10,13 @@ import logging
 import tkinter as tk
 from tkinter import ttk, messagebox
 from pathlib import Path
-from typing import Dict, List, Optional
+import os
 import tempfile
 import shutil
+import threading
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     from PIL import Image, ImageTk
@@ -24,18 +28,76 @@ except ImportError:
 try:
     import win32com.client as win32
     from pywintypes import com_error
+    import win32gui
+    import win32con
+    import win32process
+    import pythoncom
     WIN32COM_AVAILABLE = True
+    
+    # Bound once so the Excel maximize path skips repeated attribute lookups
+    _SW_MAXIMIZE = win32con.SW_MAXIMIZE
+    _ShowWindow = win32gui.ShowWindow
+    _BringWindowToTop = win32gui.BringWindowToTop
+    _SetForegroundWindow = win32gui.SetForegroundWindow
 except ImportError:
     WIN32COM_AVAILABLE = False
     logging.error("win32com not available")
 
+# Application settings switched off for a batch of inserts, in the order applied
+_EXCEL_BATCH_SETTINGS = (
+    ("ScreenUpdating", False),
+    ("Calculation", -4135),  # xlCalculationManual
+    ("EnableEvents", False),
+    ("Interactive", False),
+)
+
 # Import our modular components
 try:
+    import config
     from screenshot_colors import ModernColors
     from screenshot_capture import ScreenshotCapture
+    from window_detector import get_main_virtual_exe_window, is_virtual_exe_pid
 except ImportError:
+    from . import config
     from .screenshot_colors import ModernColors
     from .screenshot_capture import ScreenshotCapture
+    from .window_detector import get_main_virtual_exe_window, is_virtual_exe_pid
+
+
+# (config.CONFIG object, parsed mapping); load_config() creates a new parser,
+# so a reload is picked up by the identity check
+_position_mapping_cache = None
+
+
+def _parse_position_mapping(parser):
+    """
+    Parse [SCREENSHOT_MAPPING] from a loaded config.
+    
+    Returns:
+        {position number: cell} - empty if the section is missing or unusable
+    """
+    mapping = {}
+    try:
+        if parser and "SCREENSHOT_MAPPING" in parser:
+            for key, value in parser["SCREENSHOT_MAPPING"].items():
+                if key.upper().startswith("POSITION_"):
+                    try:
+                        pos_num = int(key.split("_")[1])
+                        mapping[pos_num] = value
+                    except (IndexError, ValueError) as e:
+                        logging.warning(f"✗ Invalid key format: {key} - {e}")
+    except Exception as e:
+        logging.error(f"Error loading screenshot mapping from config: {e}")
+    return mapping
+
+
+@functools.lru_cache(maxsize=32)
+def _lighten_color(hex_color, factor=1.2):
+    """Lighten a hex color for hover effect."""
+    hex_color = hex_color.lstrip('#')
+    rgb = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+    rgb = tuple(min(255, int(c * factor)) for c in rgb)
+    return f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
 
 
 # ============================================================================
@@ -55,7 +117,6 @@ class ScreenshotGUI:
         self.workbook = excel_workbook
         self.worksheet_name = worksheet_name
         self.screenshots = {}
-        self.temp_files = []
         self.temp_dir = Path(tempfile.mkdtemp(prefix="gibbscam_screenshots_"))
         
         # Load position mapping from config
@@ -64,8 +125,14 @@ class ScreenshotGUI:
         # Track visible positions
         max_pos = max(self.position_mapping.keys()) if self.position_mapping else 4
         initial_max = min(4, max_pos)
+        
+        # Positions are small dense integers, so index a tuple instead of hashing
+        self._cells = tuple(self.position_mapping.get(i) for i in range(max_pos + 1))
         self.visible_positions = list(range(1, initial_max + 1))
         self.position_widgets = {}
+        self._footer_alive = False
+        self._gibbscam_hwnd = None
+        self._busy = False
         
         logging.info(f"Initialization: max_pos={max_pos}, showing positions {self.visible_positions}")
         
@@ -111,69 +178,77 @@ class ScreenshotGUI:
         )
         
     def _load_position_mapping(self):
-        """Load screenshot position to cell mapping from config."""
-        try:
+        """
+        Load screenshot position to cell mapping from config.
+        
+        The parsed section is cached against the loaded config object, so
+        reopening the GUI doesn't re-parse it. Defaults are never cached.
+        """
+        global _position_mapping_cache
+        
+        if not config.CONFIG:
+            logging.warning("Config not loaded yet - attempting to load")
             try:
-                from . import config
-            except ImportError:
-                import config
-            
-            mapping = {}
-            
-            if not config.CONFIG:
-                logging.warning("Config not loaded yet - attempting to load")
-                try:
-                    config.load_config("config.ini")
-                except Exception as e:
-                    logging.error(f"Failed to load config: {e}")
-            
-            if config.CONFIG and "SCREENSHOT_MAPPING" in config.CONFIG:
-                logging.info("Found SCREENSHOT_MAPPING section in config")
-                
-                for key, value in config.CONFIG["SCREENSHOT_MAPPING"].items():
-                    if key.upper().startswith("POSITION_"):
-                        try:
-                            pos_num = int(key.split("_")[1])
-                            mapping[pos_num] = value
-                            logging.info(f"✓ Loaded: Position {pos_num} -> {value}")
-                        except (IndexError, ValueError) as e:
-                            logging.warning(f"✗ Invalid key format: {key} - {e}")
-            
-            if mapping:
-                logging.info(f"✓ Loaded {len(mapping)} screenshot position mappings from config")
-                return mapping
-            else:
-                logging.warning("No screenshot mappings found in config, using defaults")
-                
-        except Exception as e:
-            logging.error(f"Error loading screenshot mapping from config: {e}")
+                config.load_config("config.ini")
+            except Exception as e:
+                logging.error(f"Failed to load config: {e}")
+        
+        cached = _position_mapping_cache
+        if cached and cached[0] is config.CONFIG:
+            # Copy so callers never mutate the cached dict
+            return dict(cached[1])
         
+        mapping = _parse_position_mapping(config.CONFIG)
+        if mapping:
+            logging.info(f"✓ Loaded {len(mapping)} screenshot position mappings from config: "
+                         f"{dict(sorted(mapping.items()))}")
+            _position_mapping_cache = (config.CONFIG, mapping)
+            return dict(mapping)
+        
+        logging.warning("No screenshot mappings found in config, using defaults")
         logging.warning("Using hardcoded defaults (4 positions)")
         return {1: "G9", 2: "G31", 3: "A63", 4: "G63"}
+    
+    def _cell_for(self, position):
+        """Return the mapped cell for a position, or None if it has no mapping."""
+        return self._cells[position] if 0 < position < len(self._cells) else None
 
+    def _get_gibbscam_hwnd(self):
+        """
+        Return the GibbsCAM (virtual.exe) window handle, or None.
+        
+        The handle found by the first window lookup is cached and reused while
+        it is still a live, visible window; only then are windows re-enumerated.
+        """
+        hwnd = self._gibbscam_hwnd
+        if hwnd and win32gui.IsWindow(hwnd) and win32gui.IsWindowVisible(hwnd):
+            return hwnd
+        
+        self._gibbscam_hwnd = get_main_virtual_exe_window()
+        return self._gibbscam_hwnd
+    
+    def _is_virtual_foreground(self):
+        """
+        Check whether the foreground window belongs to virtual.exe (no enumeration).
+        
+        The foreground window may be one of GibbsCAM's dialogs, so it is only
+        used for this check and never replaces the cached main-window handle.
+        """
+        try:
+            hwnd = win32gui.GetForegroundWindow()
+            if not hwnd:
+                return False
+            _, pid = win32process.GetWindowThreadProcessId(hwnd)
+        except Exception:
+            return False
+        
+        return is_virtual_exe_pid(pid)
+    
     def _align_with_gibbscam_under_gui(self):
         """Bring GibbsCAM to foreground, then lift this Tk window above it."""
         try:
-            import win32gui
-            import win32process
-            import psutil
-
-            def find_virtual_exe():
-                windows = []
-                def callback(hwnd, _):
-                    if win32gui.IsWindowVisible(hwnd):
-                        try:
-                            _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                            if 'virtual.exe' in psutil.Process(pid).name().lower():
-                                windows.append(hwnd)
-                        except Exception:
-                            pass
-                win32gui.EnumWindows(callback, None)
-                return windows
-
-            vws = find_virtual_exe()
-            if vws:
-                hwnd = vws[0]
+            hwnd = self._get_gibbscam_hwnd()
+            if hwnd:
                 win32gui.ShowWindow(hwnd, 9)
                 win32gui.SetForegroundWindow(hwnd)
                 logging.info("✓ GibbsCAM foregrounded (startup)")
@@ -197,6 +272,9 @@ class ScreenshotGUI:
         
         # Footer with action buttons
         self._create_footer()
+        
+        # The title-bar close button behaves like Cancel
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close_request)
     
     def _create_header(self):
         """Create modern header with instructions."""
@@ -253,10 +331,11 @@ class ScreenshotGUI:
         self.canvas.create_window((0, 0), window=self.content_frame, anchor="nw")
         self.canvas.configure(yscrollcommand=scrollbar.set)
         
-        # Mouse wheel scrolling
-        def _on_mousewheel(event):
-            self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        self.canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        # Mouse wheel scrolling, coalesced to one scroll per idle pass.
+        # bind_all so the wheel also works while hovering over a card.
+        self._wheel_accum = 0
+        self._wheel_pending = False
+        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
         
         self.canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
@@ -264,15 +343,24 @@ class ScreenshotGUI:
         # Create position cards
         self.update_position_display()
     
+    def _on_mousewheel(self, event):
+        """Accumulate wheel deltas and schedule a single flush."""
+        self._wheel_accum += event.delta
+        if not self._wheel_pending:
+            self._wheel_pending = True
+            self.root.after_idle(self._flush_wheel)
+    
+    def _flush_wheel(self):
+        """Apply the accumulated wheel movement in one yview_scroll."""
+        self._wheel_pending = False
+        units = int(-1*(self._wheel_accum/120))
+        if units:
+            # Keep the part of the delta that didn't make a whole unit
+            self._wheel_accum += units * 120
+            self.canvas.yview_scroll(units, "units")
+    
     def _create_footer(self):
         """Create modern footer with action buttons."""
-        # Remove existing if present
-        if hasattr(self, 'footer_frame'):
-            try:
-                self.footer_frame.destroy()
-            except:
-                pass
-        
         # Footer container
         self.footer_frame = tk.Frame(
             self.root,
@@ -282,6 +370,10 @@ class ScreenshotGUI:
         self.footer_frame.pack(fill="x", side="bottom")
         self.footer_frame.pack_propagate(False)
         
+        # Tracked here so update_status doesn't query Tk for the widgets
+        self._footer_alive = True
+        self.footer_frame.bind("<Destroy>", self._on_footer_destroyed)
+        
         # Inner container for centering
         inner_frame = tk.Frame(self.footer_frame, bg=ModernColors.BG_SECONDARY)
         inner_frame.pack(expand=True, fill="both", padx=20, pady=15)
@@ -290,19 +382,15 @@ class ScreenshotGUI:
         left_frame = tk.Frame(inner_frame, bg=ModernColors.BG_SECONDARY)
         left_frame.pack(side="left", fill="y")
         
-        all_positions = sorted(self.position_mapping.keys())
-        max_position = all_positions[-1] if all_positions else 0
-        highest_visible = max(self.visible_positions) if self.visible_positions else 0
-        
-        if highest_visible < max_position:
-            self.add_more_button = self._create_modern_button(
-                left_frame,
-                text="➕ Add More Positions",
-                command=self.add_more_positions,
-                bg=ModernColors.ACCENT_PRIMARY,
-                fg=ModernColors.TEXT_PRIMARY
-            )
-            self.add_more_button.pack()
+        # Built once; _refresh_add_more_visibility() shows or hides it
+        self.add_more_button = self._create_modern_button(
+            left_frame,
+            text="➕ Add More Positions",
+            command=self.add_more_positions,
+            bg=ModernColors.ACCENT_PRIMARY,
+            fg=ModernColors.TEXT_PRIMARY
+        )
+        self._refresh_add_more_visibility()
         
         # Center - Status indicator
         center_frame = tk.Frame(inner_frame, bg=ModernColors.BG_SECONDARY)
@@ -345,8 +433,24 @@ class ScreenshotGUI:
         )
         self.done_button.pack(side="left", padx=5)
     
+    def _on_footer_destroyed(self, event):
+        """Mark the footer widgets as gone."""
+        self._footer_alive = False
+    
+    def _refresh_add_more_visibility(self):
+        """Show the Add More button only while hidden positions remain."""
+        max_position = max(self.position_mapping) if self.position_mapping else 0
+        highest_visible = max(self.visible_positions) if self.visible_positions else 0
+        
+        if highest_visible < max_position:
+            self.add_more_button.pack()
+        else:
+            self.add_more_button.pack_forget()
+    
     def _create_modern_button(self, parent, text, command, bg, fg, state="normal"):
         """Create a modern styled button with hover effects."""
+        light = _lighten_color(bg)
+        
         button = tk.Button(
             parent,
             text=text,
@@ -354,7 +458,7 @@ class ScreenshotGUI:
             font=("Segoe UI", 10, "bold"),
             bg=bg,
             fg=fg,
-            activebackground=self._lighten_color(bg),
+            activebackground=light,
             activeforeground=fg,
             padx=20,
             pady=10,
@@ -367,7 +471,7 @@ class ScreenshotGUI:
         # Hover effects
         def on_enter(e):
             if button['state'] == 'normal':
-                button['bg'] = self._lighten_color(bg)
+                button['bg'] = light
         
         def on_leave(e):
             button['bg'] = bg
@@ -377,13 +481,6 @@ class ScreenshotGUI:
         
         return button
     
-    def _lighten_color(self, hex_color, factor=1.2):
-        """Lighten a hex color for hover effect."""
-        hex_color = hex_color.lstrip('#')
-        rgb = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-        rgb = tuple(min(255, int(c * factor)) for c in rgb)
-        return f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
-    
     def _get_status_text(self):
         """Get current status text."""
         captured = len(self.screenshots)
@@ -397,50 +494,48 @@ class ScreenshotGUI:
             return f"{captured} of {total} screenshots captured"
     
     def update_position_display(self):
-        """Update the display of position cards."""
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
-        
-        self.position_widgets.clear()
-        
-        row = 0
-        col = 0
-        
-        for position in self.visible_positions:
-            if position not in self.position_mapping:
-                continue
-            
-            widgets = self._create_position_card(position, row, col)
-            self.position_widgets[position] = widgets
-            
-            col += 1
-            if col >= 2:
-                col = 0
-                row += 1
-        
-        self.content_frame.update_idletasks()
+        """Update the display of position cards, touching only what changed."""
+        visible = [p for p in self.visible_positions if p in self.position_mapping]
+        layout = [(position, divmod(index, 2)) for index, position in enumerate(visible)]
+        
+        for position, (row, col) in layout:
+            widgets = self.position_widgets.get(position)
+            if widgets is None:
+                self.position_widgets[position] = self._create_position_card(position, row, col)
+            elif widgets['grid'] != (row, col):
+                widgets['card_frame'].grid(row=row, column=col)
+                widgets['grid'] = (row, col)
+        
+        # Configure grid weights in one pass for all occupied rows/columns
+        if layout:
+            self.content_frame.grid_rowconfigure(tuple(range(layout[-1][1][0] + 1)), weight=1)
+            self.content_frame.grid_columnconfigure(tuple(range(min(2, len(layout)))), weight=1)
+        
+        # Let Tk lay out at idle time, then size the scroll region once
+        self.root.after_idle(lambda: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
     
     def _create_position_card(self, position, row, col):
-        """Create a modern position card."""
-        # Card container
+        """Build and place the card for a position."""
+        widgets = self._build_position_card(position)
+        widgets['card_frame'].grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
+        widgets['grid'] = (row, col)
+        
+        return widgets
+    
+    def _build_position_card(self, position):
+        """Create the widgets for a modern position card."""
+        # Card container (its own padding replaces a separate inner frame)
         card_frame = tk.Frame(
             self.content_frame,
             bg=ModernColors.BG_SECONDARY,
             relief="flat",
-            borderwidth=0
+            borderwidth=0,
+            padx=2,
+            pady=2
         )
-        card_frame.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
-        
-        # Configure grid weights
-        self.content_frame.grid_rowconfigure(row, weight=1)
-        self.content_frame.grid_columnconfigure(col, weight=1)
-        
-        # Inner content frame
-        content = tk.Frame(card_frame, bg=ModernColors.BG_SECONDARY)
-        content.pack(fill="both", expand=True, padx=2, pady=2)
         
         # Header with position number
-        header = tk.Frame(content, bg=ModernColors.BG_TERTIARY, height=40)
+        header = tk.Frame(card_frame, bg=ModernColors.BG_TERTIARY, height=40)
         header.pack(fill="x")
         header.pack_propagate(False)
         
@@ -463,58 +558,56 @@ class ScreenshotGUI:
         )
         status_dot.pack(side="right", padx=15)
         
-        # Preview area
-        preview_frame = tk.Frame(
-            content,
-            bg=ModernColors.BG_PRIMARY,
-            width=420,
-            height=180
-        )
-        preview_frame.pack(fill="both", expand=True, padx=10, pady=10)
-        preview_frame.pack_propagate(False)
+        # Preview area: one label sized in pixels by its blank preview image,
+        # with the placeholder text drawn over it
+        preview_buf = Image.new("RGB", (400, 160), ModernColors.BG_PRIMARY)
+        photo = ImageTk.PhotoImage(preview_buf)
         
         preview_label = tk.Label(
-            preview_frame,
+            card_frame,
+            image=photo,
+            compound="center",
+            width=420,
+            height=180,
             text="No screenshot",
             font=("Segoe UI", 10),
             bg=ModernColors.BG_PRIMARY,
             fg=ModernColors.TEXT_MUTED
         )
-        preview_label.pack(expand=True)
+        preview_label.image = photo
+        preview_label.pack(fill="both", expand=True, padx=10, pady=10)
         
-        # Button area
-        button_area = tk.Frame(content, bg=ModernColors.BG_SECONDARY, height=50)
+        # Button area, centred by the weighted outer columns
+        button_area = tk.Frame(card_frame, bg=ModernColors.BG_SECONDARY)
         button_area.pack(fill="x", padx=10, pady=(0, 10))
-        button_area.pack_propagate(False)
-        
-        button_container = tk.Frame(button_area, bg=ModernColors.BG_SECONDARY)
-        button_container.pack(expand=True)
+        button_area.grid_columnconfigure((0, 3), weight=1)
         
         # Capture button
         capture_button = self._create_modern_button(
-            button_container,
+            button_area,
             text="📷 Capture",
             command=lambda p=position: self.capture_screenshot(p),
             bg=ModernColors.ACCENT_SUCCESS,
             fg=ModernColors.TEXT_PRIMARY
         )
-        capture_button.pack(side="left", padx=5)
+        capture_button.grid(row=0, column=1, padx=5, pady=5)
         
         # Redo button
         redo_button = self._create_modern_button(
-            button_container,
+            button_area,
             text="🔄 Retake",
             command=lambda p=position: self.capture_screenshot(p),
             bg=ModernColors.ACCENT_WARNING,
             fg=ModernColors.TEXT_PRIMARY,
             state="disabled"
         )
-        redo_button.pack(side="left", padx=5)
+        redo_button.grid(row=0, column=2, padx=5, pady=5)
         
         return {
             'card_frame': card_frame,
-            'preview_frame': preview_frame,
             'preview_label': preview_label,
+            'preview_buf': preview_buf,
+            'photo': photo,
             'capture_button': capture_button,
             'redo_button': redo_button,
             'status_dot': status_dot
@@ -541,17 +634,17 @@ class ScreenshotGUI:
         logging.info(f"Added positions: {positions_to_add}")
         self.update_position_display()
         
-        # Restore screenshots
-        for position, image in self.screenshots.items():
-            if position in self.position_widgets:
+        # Existing cards keep their previews; only new cards need restoring
+        for position in positions_to_add:
+            image = self.screenshots.get(position)
+            if image is not None and position in self.position_widgets:
                 self.update_preview(position, image)
                 self.position_widgets[position]['redo_button'].config(state="normal")
                 self.position_widgets[position]['status_dot'].config(
                     fg=ModernColors.STATUS_CAPTURED
                 )
         
-        # Recreate footer
-        self._create_footer()
+        self._refresh_add_more_visibility()
     
     def capture_screenshot(self, position):
         """Start screenshot capture for a specific position."""
@@ -559,31 +652,18 @@ class ScreenshotGUI:
         
         self.root.withdraw()
         
+        # GibbsCAM usually regains focus once the GUI is hidden; skip the lookup then
+        if self._is_virtual_foreground():
+            logging.info("GibbsCAM (virtual.exe) already in foreground")
+            self._start_capture(position)
+            return
+        
         # Bring GibbsCAM to foreground
         try:
-            import win32gui
-            import win32process
-            import psutil
-            
-            def find_virtual_exe():
-                virtual_windows = []
-                def callback(hwnd, _):
-                    if win32gui.IsWindowVisible(hwnd):
-                        try:
-                            _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                            process = psutil.Process(pid)
-                            if 'virtual.exe' in process.name().lower():
-                                virtual_windows.append(hwnd)
-                        except:
-                            pass
-                win32gui.EnumWindows(callback, None)
-                return virtual_windows
-            
             def delayed_start():
                 try:
-                    v2 = find_virtual_exe()
-                    if v2:
-                        hwnd2 = v2[0]
+                    hwnd2 = self._get_gibbscam_hwnd()
+                    if hwnd2:
                         win32gui.ShowWindow(hwnd2, 9)
                         win32gui.SetForegroundWindow(hwnd2)
                         logging.info("✓ GibbsCAM re-forced to foreground before capture")
@@ -591,9 +671,8 @@ class ScreenshotGUI:
                     logging.warning(f"Could not re-force GibbsCAM before capture: {ee}")
                 self._start_capture(position)
 
-            virtual_windows = find_virtual_exe()
-            if virtual_windows:
-                hwnd = virtual_windows[0]
+            hwnd = self._get_gibbscam_hwnd()
+            if hwnd:
                 win32gui.ShowWindow(hwnd, 9)
                 win32gui.SetForegroundWindow(hwnd)
                 logging.info("Brought GibbsCAM (virtual.exe) to foreground")
@@ -610,11 +689,6 @@ class ScreenshotGUI:
         """Internal method to start the actual capture."""
         # Load screenshot dimensions from config
         try:
-            try:
-                from . import config
-            except ImportError:
-                import config
-            
             width_inches = float(config.get_value("SCREENSHOT", "WIDTH_INCHES", "3.0"))
             height_inches = float(config.get_value("SCREENSHOT", "HEIGHT_INCHES", "2.5"))
             dpi = config.get_int("SCREENSHOT", "DPI", 96)
@@ -660,27 +734,206 @@ class ScreenshotGUI:
         preview_width = 400
         preview_height = 160
         
-        img_copy = image.copy()
-        img_copy.thumbnail((preview_width, preview_height), Image.Resampling.LANCZOS)
+        # Fit inside the preview box without copying the full-size capture
+        scale = min(preview_width / image.width, preview_height / image.height, 1.0)
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
         
-        photo = ImageTk.PhotoImage(img_copy)
+        # Cheap box reduce first, keeping at least 2x the target for the final filter
+        factor = int(1 / scale) // 2
+        source = image.reduce(factor) if factor > 1 else image
+        thumb = source.resize(size, Image.Resampling.BILINEAR)
         
-        preview_label.config(image=photo, text="")
-        preview_label.image = photo
+        # The card's fixed-size buffer and PhotoImage are reused on every retake
+        buf = widgets['preview_buf']
+        buf.paste(ModernColors.BG_PRIMARY, (0, 0, preview_width, preview_height))
+        buf.paste(thumb, ((preview_width - size[0]) // 2, (preview_height - size[1]) // 2))
+        widgets['photo'].paste(buf)
+        
+        preview_label.config(text="")
     
     def update_status(self):
         """Update the status label."""
         count = len(self.screenshots)
         total = len(self.position_mapping)
         
-        if hasattr(self, 'status_label') and self.status_label.winfo_exists():
-            self.status_label.config(text=self._get_status_text())
+        if not self._footer_alive or self._busy:
+            return
         
-        if hasattr(self, 'done_button') and self.done_button.winfo_exists():
-            if count > 0:
-                self.done_button.config(state="normal")
-            else:
-                self.done_button.config(state="disabled")
+        self.status_label.config(text=self._get_status_text())
+        self.done_button.config(state="normal" if count > 0 else "disabled")
+    
+    def _set_busy(self, busy):
+        """
+        Lock or unlock every action while the Excel pipeline runs.
+        
+        Args:
+            busy: True to disable the buttons, False to restore them
+        """
+        self._busy = busy
+        state = "disabled" if busy else "normal"
+        
+        for position, widgets in self.position_widgets.items():
+            widgets['capture_button'].config(state=state)
+            redo_state = state if position in self.screenshots else "disabled"
+            widgets['redo_button'].config(state=redo_state)
+        
+        if self._footer_alive:
+            self.add_more_button.config(state=state)
+            self.done_button.config(state="disabled")
+        
+        if not busy:
+            self.update_status()
+    
+    def _get_cell_geometries(self, ws, cells):
+        """
+        Read (left, top, width, height) for every target cell in one pass.
+        
+        MergeArea returns the cell itself when it is not merged, so a single
+        property fetch covers both cases without a MergeCells probe.
+        """
+        geometries = {}
+        get_range = ws.Range
+        for cell in cells:
+            try:
+                area = get_range(cell).MergeArea
+                geometries[cell] = (area.Left, area.Top, area.Width, area.Height)
+            except com_error as e:
+                logging.error(f"Error reading geometry for cell {cell}: {e}")
+        return geometries
+    
+    def _save_png(self, image, path, size=None):
+        """
+        Write a screenshot to a temporary PNG for AddPicture.
+        
+        If size is given and smaller than the capture, the image is first
+        downscaled to it so Excel embeds (and redraws) only the pixels it shows.
+        
+        GibbsCAM captures are UI renders that rarely exceed 256 colors; those
+        are stored as an adaptive palette, which encodes faster and embeds
+        roughly a third of the bytes. Anything with more colors (or an alpha
+        channel) is written unchanged.
+        """
+        if size and size[0] < image.width and size[1] < image.height:
+            image = image.resize(size, Image.Resampling.LANCZOS)
+        if image.mode == "RGB" and image.getcolors(maxcolors=256) is not None:
+            image = image.convert("P", palette=Image.Palette.ADAPTIVE, colors=256)
+        image.save(path, 'PNG', compress_level=1, optimize=False)
+        return path
+    
+    def _prepare_insertions(self, screenshots, geometries):
+        """
+        Work out every insertion up front and start encoding the PNGs.
+        
+        Each image is sized for its cell (the fitted point size converted to
+        pixels at the [SCREENSHOT] DPI it was captured for) and saved on a
+        small thread pool, so the COM loop only waits on files that aren't
+        ready yet.
+        
+        Returns:
+            list of (position, cell, (left, top, width, height), temp file, save Future),
+            in position order
+        """
+        pool = ThreadPoolExecutor(max_workers=min(4, len(screenshots)))
+        # mkdtemp gives an absolute path; plain strings serve both PIL and AddPicture
+        temp_dir = str(self.temp_dir)
+        dpi = config.get_int("SCREENSHOT", "DPI", 96)
+        work_items = []
+        for position, image in sorted(screenshots.items()):
+            cell = self._cell_for(position)
+            if not cell:
+                logging.warning(f"No cell mapping for Position {position}")
+                continue
+            
+            geometry = geometries.get(cell)
+            if geometry is None:
+                continue
+            
+            placement = self._fit_in_cell(image.size, geometry)
+            _, _, width, height = placement
+            size = (max(1, round(width * dpi / 72)), max(1, round(height * dpi / 72)))
+            temp_file = os.path.join(temp_dir, f"position_{position}.png")
+            save = pool.submit(self._save_png, image, temp_file, size)
+            work_items.append((position, cell, placement, temp_file, save))
+        # Queued saves still run; COM work continues on this thread meanwhile
+        pool.shutdown(wait=False)
+        return work_items
+    
+    def _suspend_excel(self, excel_app, ws):
+        """
+        Turn off repaint, recalculation, events, user input and the sheet's
+        page-break display for a batch of inserts.
+        
+        If one of the application settings is rejected, the ones already
+        changed are put back before the error is re-raised.
+        
+        Returns:
+            The changed settings as (object, name, previous value), for _restore_excel
+        """
+        changed = []
+        
+        # Dotted page-break lines would be recomputed after every new shape.
+        # Reading or setting them raises when no printer is installed.
+        try:
+            page_breaks = ws.DisplayPageBreaks
+            ws.DisplayPageBreaks = False
+            changed.append((ws, "DisplayPageBreaks", page_breaks))
+        except com_error as e:
+            logging.warning(f"Could not hide page breaks: {e}")
+        
+        try:
+            for name, value in _EXCEL_BATCH_SETTINGS:
+                previous = getattr(excel_app, name)
+                setattr(excel_app, name, value)
+                changed.append((excel_app, name, previous))
+        except com_error:
+            self._restore_excel(changed)
+            raise
+        return changed
+    
+    def _restore_excel(self, state):
+        """
+        Put back the settings saved by _suspend_excel, newest first.
+        
+        Each one is restored on its own, so a rejected call can't leave the
+        rest (e.g. manual calculation) in place.
+        """
+        for target, name, previous in reversed(state):
+            try:
+                setattr(target, name, previous)
+            except com_error as e:
+                logging.warning(f"Could not restore Excel setting {name}: {e}")
+    
+    def _fit_in_cell(self, image_size, geometry, margin=8):
+        """
+        Centre an image inside a cell, preserving aspect ratio.
+        
+        Only the aspect ratio of image_size matters, so pixel dimensions can be
+        used directly against the cell's point geometry.
+        
+        Returns:
+            (left, top, width, height) in points
+        """
+        img_width, img_height = image_size
+        left, top, cell_width, cell_height = geometry
+        
+        scale = min((cell_width - margin) / img_width, (cell_height - margin) / img_height)
+        new_width = img_width * scale
+        new_height = img_height * scale
+        
+        return (
+            left + (cell_width - new_width) / 2,
+            top + (cell_height - new_height) / 2,
+            new_width,
+            new_height
+        )
+    
+    def _wait_for_maximize(self, hwnd, attempts=10):
+        """Pump pending window messages until hwnd reports maximized."""
+        for _ in range(attempts):
+            pythoncom.PumpWaitingMessages()
+            if win32gui.IsZoomed(hwnd):
+                return True
+        return False
     
     def finish_and_insert(self):
         """Insert all screenshots into Excel and close."""
@@ -692,81 +945,48 @@ class ScreenshotGUI:
             ws = self.workbook.Worksheets(self.worksheet_name)
             excel_app = self.workbook.Application
             
+            geometries = self._get_cell_geometries(
+                ws, [cell for cell in map(self._cell_for, self.screenshots) if cell]
+            )
+            work_items = self._prepare_insertions(self.screenshots, geometries)
+            
             inserted_count = 0
-            for position, image in sorted(self.screenshots.items()):
-                cell = self.position_mapping.get(position)
-                if not cell:
-                    logging.warning(f"No cell mapping for Position {position}")
-                    continue
-                
-                temp_file = self.temp_dir / f"position_{position}.png"
-                image.save(temp_file, 'PNG')
-                self.temp_files.append(temp_file)
-                
-                logging.info(f"Inserting Position {position} into cell {cell}")
-                
-                try:
-                    cell_range = ws.Range(cell)
-                    
-                    if cell_range.MergeCells:
-                        merge_area = cell_range.MergeArea
-                        left = merge_area.Left
-                        top = merge_area.Top
-                        cell_width = merge_area.Width
-                        cell_height = merge_area.Height
-                    else:
-                        left = cell_range.Left
-                        top = cell_range.Top
-                        cell_width = cell_range.Width
-                        cell_height = cell_range.Height
-                    
-                    picture = ws.Shapes.AddPicture(
-                        Filename=str(temp_file.absolute()),
-                        LinkToFile=False,
-                        SaveWithDocument=True,
-                        Left=left,
-                        Top=top,
-                        Width=-1,
-                        Height=-1
-                    )
-                    
-                    margin = 8
-                    target_width = cell_width - margin
-                    target_height = cell_height - margin
-                    
-                    img_width = picture.Width
-                    img_height = picture.Height
-                    aspect_ratio = img_width / img_height
-                    
-                    if target_width / target_height > aspect_ratio:
-                        new_height = target_height
-                        new_width = new_height * aspect_ratio
-                    else:
-                        new_width = target_width
-                        new_height = new_width / aspect_ratio
-                    
-                    picture.Width = new_width
-                    picture.Height = new_height
+            add_picture = ws.Shapes.AddPicture
+            state = self._suspend_excel(excel_app, ws)
+            try:
+                for position, cell, placement, temp_file, save in work_items:
+                    save.result()
                     
-                    picture.Left = left + (cell_width - new_width) / 2
-                    picture.Top = top + (cell_height - new_height) / 2
+                    logging.info(f"Inserting Position {position} into cell {cell}")
                     
-                    logging.info(f"✓ Inserted Position {position} at {cell} ({new_width:.0f}x{new_height:.0f}px)")
-                    inserted_count += 1
+                    try:
+                        left, top, new_width, new_height = placement
+                        
+                        # Final placement in the one call; no read-back of the native size
+                        add_picture(
+                            Filename=temp_file,
+                            LinkToFile=False,
+                            SaveWithDocument=True,
+                            Left=left,
+                            Top=top,
+                            Width=new_width,
+                            Height=new_height
+                        )
+                        
+                        logging.info(f"✓ Inserted Position {position} at {cell} ({new_width:.0f}x{new_height:.0f}px)")
+                        inserted_count += 1
                     
-                except com_error as e:
-                    logging.error(f"Error inserting image at {cell}: {e}")
+                    except com_error as e:
+                        logging.error(f"Error inserting image at {cell}: {e}")
+            finally:
+                self._restore_excel(state)
             
             # MAXIMIZE Excel FIRST (while hidden), THEN make it visible
             try:
-                import time
-                import win32gui
-                import win32con
-                
                 hwnd = excel_app.Hwnd
                 
-                win32gui.ShowWindow(hwnd, win32con.SW_MAXIMIZE)
-                time.sleep(0.1)
+                _ShowWindow(hwnd, _SW_MAXIMIZE)
+                self._wait_for_maximize(hwnd)
                 
                 excel_app.Visible = True
                 excel_app.ScreenUpdating = True
@@ -774,11 +994,8 @@ class ScreenshotGUI:
                 self.workbook.Activate()
                 ws.Activate()
                 
-                win32gui.SetWindowPos(hwnd, win32con.HWND_TOPMOST, 0, 0, 0, 0,
-                                     win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
-                win32gui.SetWindowPos(hwnd, win32con.HWND_NOTOPMOST, 0, 0, 0, 0,
-                                     win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
-                win32gui.SetForegroundWindow(hwnd)
+                _BringWindowToTop(hwnd)
+                _SetForegroundWindow(hwnd)
                 
                 logging.info("✓ Brought Excel to foreground and maximized")
                 
@@ -801,8 +1018,19 @@ class ScreenshotGUI:
             logging.error(f"Error inserting screenshots: {e}")
             messagebox.showerror("Error", f"Failed to insert screenshots:\n{e}")
     
+    def _on_close_request(self):
+        """Window close button: ignored while Excel is being built, otherwise Cancel."""
+        if self._busy:
+            logging.info("Close ignored: Excel creation still running")
+            return
+        
+        self.cancel()
+    
     def cancel(self):
         """Cancel and close without inserting."""
+        if self._busy:
+            return
+        
         if self.screenshots:
             result = messagebox.askyesno(
                 "Cancel",
@@ -816,13 +1044,13 @@ class ScreenshotGUI:
         self.root.destroy()
     
     def cleanup(self):
-        """Clean up temporary files."""
-        try:
-            if self.temp_dir.exists():
-                shutil.rmtree(self.temp_dir)
-                logging.info("✓ Cleaned up temporary screenshot files")
-        except Exception as e:
-            logging.warning(f"Could not clean up temp files: {e}")
+        """Clean up temporary files on a background thread so the GUI closes immediately."""
+        threading.Thread(
+            target=shutil.rmtree,
+            args=(self.temp_dir,),
+            kwargs={'ignore_errors': True},
+            daemon=True
+        ).start()
     
     def show(self):
         """Show the GUI and start main loop."""
@@ -855,7 +1083,6 @@ class ScreenshotGUIWithExcelCreation(ScreenshotGUI):
         self.workbook = None
         self.worksheet_name = sheet_name
         self.screenshots = {}
-        self.temp_files = []
         self.temp_dir = Path(tempfile.mkdtemp(prefix="gibbscam_screenshots_"))
         self.success = False
         
@@ -865,8 +1092,14 @@ class ScreenshotGUIWithExcelCreation(ScreenshotGUI):
         # Track visible positions
         max_pos = max(self.position_mapping.keys()) if self.position_mapping else 4
         initial_max = min(4, max_pos)
+        
+        # Positions are small dense integers, so index a tuple instead of hashing
+        self._cells = tuple(self.position_mapping.get(i) for i in range(max_pos + 1))
         self.visible_positions = list(range(1, initial_max + 1))
         self.position_widgets = {}
+        self._footer_alive = False
+        self._gibbscam_hwnd = None
+        self._busy = False
         
         logging.info(f"Initialization: max_pos={max_pos}, showing positions {self.visible_positions}")
         
@@ -881,6 +1114,9 @@ class ScreenshotGUIWithExcelCreation(ScreenshotGUI):
         """
         Override: Create Excel with data, insert screenshots, then show maximized.
         This runs when user clicks Done button.
+        
+        The Excel work runs on a background thread so the window keeps
+        repainting; only the unsaved-changes prompt happens here.
         """
         if not self.screenshots:
             messagebox.showwarning("No Screenshots", "Please capture at least one screenshot first.")
@@ -888,50 +1124,139 @@ class ScreenshotGUIWithExcelCreation(ScreenshotGUI):
         
         logging.info("Creating Excel file with data and screenshots...")
         
+        # Check if file is already open with unsaved changes
         try:
-            # Check if file is already open with unsaved changes
-            import win32com.client as win32
-            import time
-            import gc
-            
-            try:
+            # A file that isn't on disk yet can't be open; skip attaching to Excel
+            if self.output_path.exists():
                 excel_app_check = win32.GetObject(Class="Excel.Application")
-                
-                for i in range(1, excel_app_check.Workbooks.Count + 1):
-                    try:
-                        wb_check = excel_app_check.Workbooks(i)
-                        if Path(wb_check.FullName).resolve() == self.output_path.resolve():
-                            logging.warning(f"File is already open: {self.output_path.name}")
+                workbook_count = excel_app_check.Workbooks.Count
+            else:
+                workbook_count = 0
+            
+            # Plain string compare first; resolve() (filesystem I/O) only for
+            # same-named files that might be a mapped-drive/UNC alias
+            target = os.path.normcase(os.path.abspath(self.output_path))
+            target_name = os.path.basename(target)
+            
+            for i in range(1, workbook_count + 1):
+                try:
+                    wb_check = excel_app_check.Workbooks(i)
+                    full_name = os.path.normcase(os.path.abspath(wb_check.FullName))
+                    if full_name == target or (
+                        os.path.basename(full_name) == target_name
+                        and Path(full_name).resolve() == self.output_path.resolve()
+                    ):
+                        logging.warning(f"File is already open: {self.output_path.name}")
+                        
+                        if not wb_check.Saved:
+                            result = messagebox.askyesnocancel(
+                                "Unsaved Changes",
+                                f"The file '{self.output_path.name}' is already open with unsaved changes.\n\n"
+                                "Yes - Save and continue\n"
+                                "No - Discard changes and continue\n"
+                                "Cancel - Stop",
+                                icon="warning"
+                            )
                             
-                            if not wb_check.Saved:
-                                result = messagebox.askyesnocancel(
-                                    "Unsaved Changes",
-                                    f"The file '{self.output_path.name}' is already open with unsaved changes.\n\n"
-                                    "Yes - Save and continue\n"
-                                    "No - Discard changes and continue\n"
-                                    "Cancel - Stop",
-                                    icon="warning"
-                                )
-                                
-                                if result is None:
-                                    logging.info("User cancelled due to unsaved changes")
-                                    return
-                                elif result:
-                                    logging.info("Saving existing workbook...")
-                                    wb_check.Save()
-                                    wb_check.Close(SaveChanges=False)
-                                else:
-                                    logging.info("Discarding changes...")
-                                    wb_check.Close(SaveChanges=False)
+                            if result is None:
+                                logging.info("User cancelled due to unsaved changes")
+                                return
+                            elif result:
+                                logging.info("Saving existing workbook...")
+                                wb_check.Save()
+                                wb_check.Close(SaveChanges=False)
                             else:
-                                logging.info("Closing existing workbook (no unsaved changes)")
+                                logging.info("Discarding changes...")
                                 wb_check.Close(SaveChanges=False)
-                            break
-                    except:
-                        pass
-            except:
-                pass
-            
+                        else:
+                            logging.info("Closing existing workbook (no unsaved changes)")
+                            wb_check.Close(SaveChanges=False)
+                        break
+                except:
+                    pass
+        except:
+            pass
+        
+        # Drop the check's COM proxies now rather than relying on a later sweep
+        wb_check = excel_app_check = None
+        pythoncom.CoFreeUnusedLibraries()
+        
+        # Hand the Excel pipeline to a worker thread (copy the dict so the
+        # worker never touches state the Tk thread may change)
+        self._set_busy(True)
+        self.status_label.config(text="Creating Excel file...")
+        threading.Thread(
+            target=self._done_worker,
+            args=(dict(self.screenshots),),
+            daemon=True
+        ).start()
+    
+    def _done_worker(self, screenshots):
+        """Run the Excel pipeline in its own COM apartment, then report back to Tk."""
+        pythoncom.CoInitialize()
+        try:
+            error = self._create_excel_with_screenshots(screenshots)
+        finally:
+            pythoncom.CoUninitialize()
+        
+        self.root.after(0, self._on_worker_done, error)
+    
+    def _on_worker_done(self, error):
+        """Back on the Tk thread: report any error and close the GUI."""
+        if error:
+            message, close = error
+            messagebox.showerror("Error", message)
+            if not close:
+                self._set_busy(False)
+                return
+        
+        self.cleanup()
+        self.root.destroy()
+    
+    def _open_workbook(self, excel_app, path, attempts=5):
+        """
+        Open a workbook, retrying briefly while a just-saved copy releases its lock.
+        
+        Replaces a fixed pre-open sleep: the common case opens first time.
+        """
+        for attempt in range(attempts):
+            try:
+                return excel_app.Workbooks.Open(path, ReadOnly=False)
+            except com_error as e:
+                if attempt == attempts - 1:
+                    raise
+                logging.debug(f"Workbook not ready yet ({e}), retrying...")
+                pythoncom.PumpWaitingMessages()
+                time.sleep(0.05 * (attempt + 1))
+    
+    def _save_workbook(self, wb, attempts=5):
+        """
+        Save a workbook that is already visible, retrying while Excel is busy.
+        
+        Once Excel is on screen the user can be mid-click, and the call may be
+        rejected (RPC_E_CALL_REJECTED) until Excel is idle again.
+        
+        Returns:
+            True if the workbook was saved
+        """
+        for attempt in range(attempts):
+            try:
+                wb.Save()
+                return True
+            except com_error as e:
+                logging.debug(f"Save rejected ({e}), retrying...")
+                pythoncom.PumpWaitingMessages()
+                time.sleep(0.2 * (attempt + 1))
+        return False
+    
+    def _create_excel_with_screenshots(self, screenshots):
+        """
+        Create the Excel file and insert screenshots (worker thread).
+        
+        Returns:
+            None on success, otherwise (error message, whether to close the GUI)
+        """
+        try:
             # Import excel_mapper
             try:
                 from . import excel_mapper
@@ -946,23 +1271,19 @@ class ScreenshotGUIWithExcelCreation(ScreenshotGUI):
                 self.output_path,
                 self.worksheet_name,
                 open_excel=False,
-                enable_screenshots=False
+                enable_screenshots=False,
+                backend=config.get_value("BEHAVIOR", "EXCEL_BACKEND", "COM").strip().lower()
             )
             
             if not result:
                 logging.error("Failed to create Excel with data")
-                messagebox.showerror("Error", "Failed to create Excel file with coordinate data")
-                return
+                return ("Failed to create Excel file with coordinate data", False)
             
             logging.info("✓ Excel created with coordinate data")
             
             # Step 2: Open the Excel file
             logging.info("Step 2: Opening Excel to insert screenshots...")
             
-            # Force garbage collection and wait
-            gc.collect()
-            time.sleep(0.3)
-            
             # Get existing Excel instance or create new one
             try:
                 excel_app = win32.GetObject(Class="Excel.Application")
@@ -977,7 +1298,7 @@ class ScreenshotGUIWithExcelCreation(ScreenshotGUI):
             
             # Open the workbook
             logging.info(f"Opening: {self.output_path}")
-            wb = excel_app.Workbooks.Open(str(self.output_path.absolute()), ReadOnly=False)
+            wb = self._open_workbook(excel_app, str(self.output_path.absolute()))
             ws = wb.Worksheets(self.worksheet_name)
             
             logging.info("✓ Excel opened for screenshot insertion")
@@ -986,87 +1307,52 @@ class ScreenshotGUIWithExcelCreation(ScreenshotGUI):
             logging.info("Step 3: Inserting screenshots...")
             inserted_count = 0
             
-            for position, image in sorted(self.screenshots.items()):
-                cell = self.position_mapping.get(position)
-                if not cell:
-                    logging.warning(f"No cell mapping for Position {position}")
-                    continue
-                
-                temp_file = self.temp_dir / f"position_{position}.png"
-                image.save(temp_file, 'PNG')
-                self.temp_files.append(temp_file)
-                
-                logging.info(f"Inserting Position {position} into cell {cell}")
-                
-                try:
-                    cell_range = ws.Range(cell)
-                    
-                    if cell_range.MergeCells:
-                        merge_area = cell_range.MergeArea
-                        left = merge_area.Left
-                        top = merge_area.Top
-                        cell_width = merge_area.Width
-                        cell_height = merge_area.Height
-                    else:
-                        left = cell_range.Left
-                        top = cell_range.Top
-                        cell_width = cell_range.Width
-                        cell_height = cell_range.Height
-                    
-                    picture = ws.Shapes.AddPicture(
-                        Filename=str(temp_file.absolute()),
-                        LinkToFile=False,
-                        SaveWithDocument=True,
-                        Left=left,
-                        Top=top,
-                        Width=-1,
-                        Height=-1
-                    )
-                    
-                    margin = 8
-                    target_width = cell_width - margin
-                    target_height = cell_height - margin
-                    
-                    img_width = picture.Width
-                    img_height = picture.Height
-                    aspect_ratio = img_width / img_height
-                    
-                    if target_width / target_height > aspect_ratio:
-                        new_height = target_height
-                        new_width = new_height * aspect_ratio
-                    else:
-                        new_width = target_width
-                        new_height = new_width / aspect_ratio
-                    
-                    picture.Width = new_width
-                    picture.Height = new_height
+            geometries = self._get_cell_geometries(
+                ws, [cell for cell in map(self._cell_for, screenshots) if cell]
+            )
+            work_items = self._prepare_insertions(screenshots, geometries)
+            
+            add_picture = ws.Shapes.AddPicture
+            state = self._suspend_excel(excel_app, ws)
+            try:
+                for position, cell, placement, temp_file, save in work_items:
+                    save.result()
                     
-                    picture.Left = left + (cell_width - new_width) / 2
-                    picture.Top = top + (cell_height - new_height) / 2
+                    logging.info(f"Inserting Position {position} into cell {cell}")
                     
-                    logging.info(f"✓ Inserted Position {position} at {cell}")
-                    inserted_count += 1
+                    try:
+                        left, top, new_width, new_height = placement
+                        
+                        # Final placement in the one call; no read-back of the native size
+                        add_picture(
+                            Filename=temp_file,
+                            LinkToFile=False,
+                            SaveWithDocument=True,
+                            Left=left,
+                            Top=top,
+                            Width=new_width,
+                            Height=new_height
+                        )
+                        
+                        logging.info(f"✓ Inserted Position {position} at {cell}")
+                        inserted_count += 1
                     
-                except Exception as e:
-                    logging.error(f"Error inserting image at {cell}: {e}")
+                    except Exception as e:
+                        logging.error(f"Error inserting image at {cell}: {e}")
+            finally:
+                self._restore_excel(state)
             
             logging.info(f"✓ Inserted {inserted_count} screenshot(s)")
             
-            # Step 4: Save the workbook
-            logging.info("Step 4: Saving workbook...")
-            wb.Save()
-            logging.info("✓ Workbook saved")
-            
-            # Step 5: Show Excel MAXIMIZED
-            logging.info("Step 5: Showing Excel maximized...")
-            import win32gui
-            import win32con
-            
+            # Step 4: Show Excel MAXIMIZED
+            logging.info("Step 4: Showing Excel maximized...")
             try:
+                # The user takes over from here; let Excel prompt about unsaved changes
+                excel_app.DisplayAlerts = True
                 hwnd = excel_app.Hwnd
                 
-                win32gui.ShowWindow(hwnd, win32con.SW_MAXIMIZE)
-                time.sleep(0.1)
+                _ShowWindow(hwnd, _SW_MAXIMIZE)
+                self._wait_for_maximize(hwnd)
                 
                 excel_app.Visible = True
                 excel_app.ScreenUpdating = True
@@ -1074,16 +1360,14 @@ class ScreenshotGUIWithExcelCreation(ScreenshotGUI):
                 wb.Activate()
                 ws.Activate()
                 
-                win32gui.SetWindowPos(hwnd, win32con.HWND_TOPMOST, 0, 0, 0, 0,
-                                     win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
-                win32gui.SetWindowPos(hwnd, win32con.HWND_NOTOPMOST, 0, 0, 0, 0,
-                                     win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
-                win32gui.SetForegroundWindow(hwnd)
+                _BringWindowToTop(hwnd)
+                _SetForegroundWindow(hwnd)
                 
                 logging.info("✓ Excel shown maximized")
                 
             except Exception as e:
                 logging.warning(f"Could not maximize Excel: {e}")
+                excel_app.DisplayAlerts = True
                 excel_app.Visible = True
                 excel_app.ScreenUpdating = True
                 try:
@@ -1091,19 +1375,31 @@ class ScreenshotGUIWithExcelCreation(ScreenshotGUI):
                 except:
                     pass
             
+            # Step 5: Save the workbook once Excel is already on screen, so the
+            # xlsx write happens behind the repaint instead of before it
+            if inserted_count:
+                logging.info("Step 5: Saving workbook...")
+                if not self._save_workbook(wb):
+                    logging.error("✗ Could not save workbook")
+                    self.success = False
+                    return (
+                        f"The screenshots were inserted, but the workbook could not be saved:\n"
+                        f"{self.output_path}\n\nSave it in Excel before closing it.",
+                        True
+                    )
+                logging.info("✓ Workbook saved")
+            else:
+                logging.info("Step 5: Nothing inserted - workbook left unchanged, skipping save")
+            
             self.success = True
             logging.info("✓ Complete! Excel created with data and screenshots")
-            
-            self.cleanup()
-            self.root.destroy()
+            return None
             
         except Exception as e:
             logging.error(f"Error in finish_and_insert: {e}")
             logging.exception("Full traceback:")
-            messagebox.showerror("Error", f"Failed to create Excel:\n{e}")
             self.success = False
-            self.cleanup()
-            self.root.destroy()
+            return (f"Failed to create Excel:\n{e}", True)
 
 
 # ============================================================================
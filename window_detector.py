@@ -9,18 +9,157 @@ import logging
 from pathlib import Path
 from typing import Optional, List
 import os
+import ctypes
+import ctypes.wintypes
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 
 try:
     import win32gui
     import win32process
-    import psutil
     WIN32_AVAILABLE = True
 except ImportError:
     win32gui = None
     win32process = None
-    psutil = None
     WIN32_AVAILABLE = False
-    logging.warning("win32gui/psutil not available - window detection disabled")
+    logging.warning("win32gui not available - window detection disabled")
+
+_PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+_TH32CS_SNAPPROCESS = 0x2
+_TH32CS_SNAPTHREAD = 0x4
+_GW_OWNER = 4
+_GWL_EXSTYLE = -20
+_WS_EX_TOOLWINDOW = 0x80
+
+
+class _PROCESSENTRY32W(ctypes.Structure):
+    _fields_ = [
+        ("dwSize", ctypes.wintypes.DWORD),
+        ("cntUsage", ctypes.wintypes.DWORD),
+        ("th32ProcessID", ctypes.wintypes.DWORD),
+        ("th32DefaultHeapID", ctypes.c_size_t),
+        ("th32ModuleID", ctypes.wintypes.DWORD),
+        ("cntThreads", ctypes.wintypes.DWORD),
+        ("th32ParentProcessID", ctypes.wintypes.DWORD),
+        ("pcPriClassBase", ctypes.wintypes.LONG),
+        ("dwFlags", ctypes.wintypes.DWORD),
+        ("szExeFile", ctypes.c_wchar * 260),
+    ]
+
+
+class _THREADENTRY32(ctypes.Structure):
+    _fields_ = [
+        ("dwSize", ctypes.wintypes.DWORD),
+        ("cntUsage", ctypes.wintypes.DWORD),
+        ("th32ThreadID", ctypes.wintypes.DWORD),
+        ("th32OwnerProcessID", ctypes.wintypes.DWORD),
+        ("tpBasePri", ctypes.wintypes.LONG),
+        ("tpDeltaPri", ctypes.wintypes.LONG),
+        ("dwFlags", ctypes.wintypes.DWORD),
+    ]
+
+# Private kernel32 instance: setting argtypes/restype on ctypes.windll.kernel32
+# would change those functions for every other ctypes user in the process
+try:
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+except (AttributeError, OSError):
+    _kernel32 = None  # Not on Windows
+else:
+    _kernel32.OpenProcess.argtypes = (ctypes.wintypes.DWORD, ctypes.wintypes.BOOL, ctypes.wintypes.DWORD)
+    _kernel32.OpenProcess.restype = ctypes.wintypes.HANDLE
+    _kernel32.QueryFullProcessImageNameW.argtypes = (
+        ctypes.wintypes.HANDLE, ctypes.wintypes.DWORD,
+        ctypes.wintypes.LPWSTR, ctypes.POINTER(ctypes.wintypes.DWORD)
+    )
+    _kernel32.QueryFullProcessImageNameW.restype = ctypes.wintypes.BOOL
+    _kernel32.CloseHandle.argtypes = (ctypes.wintypes.HANDLE,)
+    _kernel32.CloseHandle.restype = ctypes.wintypes.BOOL
+    _kernel32.CreateToolhelp32Snapshot.argtypes = (ctypes.wintypes.DWORD, ctypes.wintypes.DWORD)
+    _kernel32.CreateToolhelp32Snapshot.restype = ctypes.wintypes.HANDLE
+    _kernel32.Process32FirstW.argtypes = (ctypes.wintypes.HANDLE, ctypes.POINTER(_PROCESSENTRY32W))
+    _kernel32.Process32FirstW.restype = ctypes.wintypes.BOOL
+    _kernel32.Process32NextW.argtypes = (ctypes.wintypes.HANDLE, ctypes.POINTER(_PROCESSENTRY32W))
+    _kernel32.Process32NextW.restype = ctypes.wintypes.BOOL
+    _kernel32.Thread32First.argtypes = (ctypes.wintypes.HANDLE, ctypes.POINTER(_THREADENTRY32))
+    _kernel32.Thread32First.restype = ctypes.wintypes.BOOL
+    _kernel32.Thread32Next.argtypes = (ctypes.wintypes.HANDLE, ctypes.POINTER(_THREADENTRY32))
+    _kernel32.Thread32Next.restype = ctypes.wintypes.BOOL
+
+# Filename before a .vnc/.ncf extension. Path separators are left out of the
+# class so the match is already the bare name (no Path() split needed).
+_NCF_TITLE_RE = re.compile(r"([\w\-\s.]+)\.(?:vnc|ncf)\b", re.IGNORECASE)
+
+
+def _process_image_name(pid: int) -> str:
+    """
+    Return the lower-cased executable name of a process ('' if unavailable).
+    
+    One OpenProcess + QueryFullProcessImageNameW; the limited-information
+    access right also works for elevated processes.
+    """
+    if _kernel32 is None:
+        return ""
+    handle = _kernel32.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        return ""
+    try:
+        size = ctypes.wintypes.DWORD(260)
+        buffer = ctypes.create_unicode_buffer(size.value)
+        if not _kernel32.QueryFullProcessImageNameW(handle, 0, buffer, ctypes.byref(size)):
+            return ""
+        return os.path.basename(buffer.value).lower()
+    finally:
+        _kernel32.CloseHandle(handle)
+
+
+def is_virtual_exe_pid(pid: int) -> bool:
+    """
+    Check whether a process is GibbsCAM (virtual.exe).
+    
+    Args:
+        pid: Process ID, e.g. from win32process.GetWindowThreadProcessId
+        
+    Returns:
+        True if the process image is virtual.exe
+    """
+    return 'virtual.exe' in _process_image_name(pid)
+
+
+def _virtual_exe_threads() -> Optional[List[tuple]]:
+    """
+    List the threads of every running virtual.exe from one Toolhelp32 snapshot.
+    
+    Returns:
+        List of tuples: [(thread_id, pid), ...], or None if the snapshot failed
+    """
+    if _kernel32 is None:
+        return None
+    snapshot = _kernel32.CreateToolhelp32Snapshot(_TH32CS_SNAPPROCESS | _TH32CS_SNAPTHREAD, 0)
+    if snapshot in (None, ctypes.wintypes.HANDLE(-1).value):
+        return None
+    
+    try:
+        pids = set()
+        process = _PROCESSENTRY32W()
+        process.dwSize = ctypes.sizeof(process)
+        ok = _kernel32.Process32FirstW(snapshot, ctypes.byref(process))
+        while ok:
+            if 'virtual.exe' in process.szExeFile.lower():
+                pids.add(process.th32ProcessID)
+            ok = _kernel32.Process32NextW(snapshot, ctypes.byref(process))
+        
+        threads = []
+        if pids:
+            thread = _THREADENTRY32()
+            thread.dwSize = ctypes.sizeof(thread)
+            ok = _kernel32.Thread32First(snapshot, ctypes.byref(thread))
+            while ok:
+                if thread.th32OwnerProcessID in pids:
+                    threads.append((thread.th32ThreadID, thread.th32OwnerProcessID))
+                ok = _kernel32.Thread32Next(snapshot, ctypes.byref(thread))
+        return threads
+    finally:
+        _kernel32.CloseHandle(snapshot)
 
 
 def get_virtual_exe_windows() -> List[tuple]:
@@ -36,6 +175,38 @@ def get_virtual_exe_windows() -> List[tuple]:
     
     virtual_windows = []
     
+    def add_window(hwnd, pid):
+        """Record a visible, titled virtual.exe window."""
+        title = win32gui.GetWindowText(hwnd).strip()
+        if title:
+            virtual_windows.append((hwnd, title, pid))
+            logging.debug(f"Found virtual.exe window: {title}")
+    
+    # Fast path: walk only virtual.exe's own threads instead of every window
+    try:
+        threads = _virtual_exe_threads()
+    except Exception as e:
+        logging.debug(f"Thread snapshot unavailable, enumerating all windows: {e}")
+        threads = None
+    
+    if threads is not None:
+        def thread_callback(hwnd, pid):
+            """Callback function for EnumThreadWindows."""
+            if win32gui.IsWindowVisible(hwnd):
+                add_window(hwnd, pid)
+        
+        for thread_id, pid in threads:
+            try:
+                win32gui.EnumThreadWindows(thread_id, thread_callback, pid)
+            except win32gui.error:
+                pass  # Threads without top-level windows report failure
+        
+        logging.info(f"Found {len(virtual_windows)} virtual.exe window(s)")
+        return virtual_windows
+    
+    # One process-name lookup per PID; a process usually owns many windows
+    pid_names = {}
+    
     def callback(hwnd, _):
         """Callback function for EnumWindows."""
         if win32gui.IsWindowVisible(hwnd):
@@ -44,18 +215,14 @@ def get_virtual_exe_windows() -> List[tuple]:
                 _, pid = win32process.GetWindowThreadProcessId(hwnd)
                 
                 # Get process name
-                try:
-                    process = psutil.Process(pid)
-                    process_name = process.name().lower()
-                    
-                    # Check if this is virtual.exe
-                    if 'virtual.exe' in process_name:
-                        title = win32gui.GetWindowText(hwnd).strip()
-                        if title:
-                            virtual_windows.append((hwnd, title, pid))
-                            logging.debug(f"Found virtual.exe window: {title}")
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
+                process_name = pid_names.get(pid)
+                if process_name is None:
+                    process_name = _process_image_name(pid)
+                    pid_names[pid] = process_name
+                
+                # Check if this is virtual.exe (title only read for its windows)
+                if 'virtual.exe' in process_name:
+                    add_window(hwnd, pid)
                     
             except Exception as e:
                 logging.debug(f"Error checking window: {e}")
@@ -69,6 +236,40 @@ def get_virtual_exe_windows() -> List[tuple]:
     return virtual_windows
 
 
+def get_main_virtual_exe_window() -> Optional[int]:
+    """
+    Get the handle of GibbsCAM's main window.
+    
+    get_virtual_exe_windows() lists windows in thread order, so the first
+    entry may be a tool window or dialog. The main window is taken to be the
+    largest unowned, non-tool window (by its restored size, so a minimized
+    main window still wins).
+    
+    Returns:
+        Window handle, or None if virtual.exe has no visible windows
+    """
+    windows = get_virtual_exe_windows()
+    best_hwnd, best_area = None, -1
+    
+    for hwnd, _, _ in windows:
+        try:
+            if win32gui.GetWindow(hwnd, _GW_OWNER):
+                continue
+            if win32gui.GetWindowLong(hwnd, _GWL_EXSTYLE) & _WS_EX_TOOLWINDOW:
+                continue
+            left, top, right, bottom = win32gui.GetWindowPlacement(hwnd)[4]
+        except win32gui.error:
+            continue
+        
+        area = (right - left) * (bottom - top)
+        if area > best_area:
+            best_hwnd, best_area = hwnd, area
+    
+    if best_hwnd is None and windows:
+        best_hwnd = windows[0][0]
+    return best_hwnd
+
+
 def extract_filename_from_title(title: str) -> Optional[str]:
     """
     Extract .NCF filename from window title.
@@ -83,12 +284,10 @@ def extract_filename_from_title(title: str) -> Optional[str]:
     """
     # Look for .vnc or .ncf in window title
     # Pattern matches: "path\file.vnc" or "file.ncf" etc.
-    match = re.search(r"([\w\-\s\\/.]+)\.(vnc|ncf)", title, re.IGNORECASE)
+    match = _NCF_TITLE_RE.search(title)
     if match:
-        # Extract just the filename and ensure .NCF extension
-        filename = Path(match.group(1)).name
-        ncf_filename = f"{filename}.NCF"
-        return ncf_filename
+        # Ensure .NCF extension
+        return f"{match.group(1)}.NCF"
     
     return None
 
@@ -107,7 +306,7 @@ def get_active_gibbscam_file() -> Optional[str]:
     """
     if not WIN32_AVAILABLE:
         logging.error("Cannot detect GibbsCAM file - missing required libraries")
-        logging.error("Install with: pip install pywin32 psutil")
+        logging.error("Install with: pip install pywin32")
         return None
     
     virtual_windows = get_virtual_exe_windows()
@@ -138,6 +337,27 @@ def get_active_gibbscam_file() -> Optional[str]:
     return None
 
 
+def _scan_dir(directory: str, target_lower: str):
+    """
+    List one directory for search_ncf_in_network.
+    
+    Returns:
+        (path of a file whose lowercased name is target_lower or None, subdirectory paths)
+    """
+    subdirs = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                # scandir carries the entry type, so no extra stat per entry
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.lower() == target_lower:
+                    return entry.path, subdirs
+    except OSError as e:
+        logging.debug(f"Skipping unreadable directory {directory}: {e}")
+    return None, subdirs
+
+
 def search_ncf_in_network(filename: str, network_path: Path) -> Optional[Path]:
     """
     Search for NCF file in network path.
@@ -166,21 +386,30 @@ def search_ncf_in_network(filename: str, network_path: Path) -> Optional[Path]:
             logging.info(f"✓ Found NCF file (direct): {direct_path}")
             return direct_path
         
-        # Try case-insensitive search in subdirectories
+        # Try case-insensitive search in subdirectories, level by level.
+        # Directories of a level are listed concurrently to hide share latency.
         logging.info("Searching subdirectories (this may take a moment)...")
-        for root, dirs, files in os.walk(network_path):
-            # Case-insensitive comparison
-            for file in files:
-                if file.lower() == filename.lower():
-                    found_path = Path(root) / file
-                    logging.info(f"✓ Found NCF file: {found_path}")
-                    return found_path
-            
+        target_lower = filename.lower()
+        level = [str(network_path)]
+        pool = ThreadPoolExecutor(max_workers=8)
+        try:
             # Limit search depth to avoid too long search times
-            depth = len(Path(root).relative_to(network_path).parts)
-            if depth > 3:  # Only search 3 levels deep
-                dirs.clear()  # Don't search deeper
+            for _ in range(5):  # Root plus 4 levels of subdirectories
+                next_level = []
+                for found, subdirs in pool.map(_scan_dir, level, repeat(target_lower)):
+                    if found:
+                        found_path = Path(found)
+                        logging.info(f"✓ Found NCF file: {found_path}")
+                        return found_path
+                    next_level.extend(subdirs)
                 
+                level = next_level
+                if not level:
+                    break
+        finally:
+            # Don't wait on listings still queued for this level once a match is found
+            pool.shutdown(wait=False, cancel_futures=True)
+        
     except Exception as e:
         logging.error(f"Error searching network: {e}")
     
@@ -201,7 +430,7 @@ if __name__ == "__main__":
     
     if not WIN32_AVAILABLE:
         print("ERROR: Required libraries not installed")
-        print("Install with: pip install pywin32 psutil")
+        print("Install with: pip install pywin32")
         exit(1)
     
     # Test 1: Find virtual.exe windows